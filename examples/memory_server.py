@@ -1,14 +1,19 @@
 """
 A memory server example using SQLite to store and retrieve memories.
 This example demonstrates how to create a persistent memory store with ezmcp.
+
+Requires the `aiosqlite` and `orjson` packages.
 """
 
-import json
+import asyncio
 import os
 import sqlite3
-from datetime import datetime
+from pathlib import Path
 from typing import Dict, Optional
 
+import aiosqlite
+import orjson
+
 from ezmcp import TextContent, ezmcp
 
 # Create an ezmcp application
@@ -17,29 +22,399 @@ app = ezmcp("memory-server", debug=True)
 # SQLite database setup
 DB_PATH = "memory.db"
 
+# Applied once to the shared connection when the server starts
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Applied to the read-only connection the read tools use
+READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Writes are queued and committed by a single writer task in batches of up
+# to WRITE_BATCH_SIZE operations, waiting at most WRITE_BATCH_WINDOW seconds
+# for a batch to fill so each commit covers as many writes as possible.
+# Reads go through a separate read-only connection, so in WAL mode they only
+# ever see committed batches.
+WRITE_BATCH_SIZE = 64
+WRITE_BATCH_WINDOW = 0.005
+
+# Refresh the query planner statistics after this many committed writes
+OPTIMIZE_EVERY_WRITES = 1000
+
+# Metadata is stored as binary JSONB where SQLite supports it (3.45+) and as
+# minified JSON text otherwise; reads always go through json() to get text
+METADATA_JSON_FUNC = "jsonb" if sqlite3.sqlite_version_info >= (3, 45) else "json"
+
+# SQL used by the tools. Passing the same string objects on every call keeps
+# the lookups in sqlite3's prepared statement cache cheap and predictable.
+SQL_UPSERT = f"""
+INSERT INTO memories (key, value, metadata)
+VALUES (?, ?, {METADATA_JSON_FUNC}(?))
+ON CONFLICT(key) DO UPDATE SET
+    value = excluded.value,
+    metadata = excluded.metadata,
+    updated_at = unixepoch(),
+    revision = revision + 1
+RETURNING revision = 0
+"""
+SQL_GET_BY_KEY = (
+    "SELECT value, json(metadata), created_at, updated_at FROM memories WHERE key = ?"
+)
+SQL_LIST = "SELECT key, value, json(metadata), created_at, updated_at, id FROM memories ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+SQL_LIST_AFTER = "SELECT key, value, json(metadata), created_at, updated_at, id FROM memories WHERE (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT ?"
+SQL_DELETE = "DELETE FROM memories WHERE key = ?"
+SQL_SEARCH_FTS = """
+SELECT m.key, m.value, json(m.metadata), m.created_at, m.updated_at
+FROM memories_fts f JOIN memories m ON m.id = f.rowid
+WHERE f.value LIKE ?
+ORDER BY m.created_at DESC LIMIT ?
+"""
+SQL_SEARCH_SCAN = "SELECT key, value, json(metadata), created_at, updated_at FROM memories WHERE value LIKE ? ORDER BY created_at DESC LIMIT ?"
+SQL_FIND_BY_TAG = "SELECT key, value, json(metadata), created_at, updated_at FROM memories WHERE tag = ? ORDER BY created_at DESC LIMIT ?"
+
+# Current layout of the memories table
+MEMORIES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    value TEXT NOT NULL,
+    metadata BLOB,
+    created_at INTEGER NOT NULL DEFAULT (unixepoch()),
+    updated_at INTEGER NOT NULL DEFAULT (unixepoch()),
+    revision INTEGER NOT NULL DEFAULT 0,
+    tag TEXT GENERATED ALWAYS AS (metadata ->> 'tag') VIRTUAL
+)
+"""
+
+# Copies rows from a memories table of an older schema, keeping the latest
+# row for each key and converting the local-time ISO 8601 text timestamps
+# written by datetime.now().isoformat() to unix seconds
+SQL_MIGRATE_COPY = f"""
+INSERT INTO memories (id, key, value, metadata, created_at, updated_at)
+SELECT
+    id,
+    key,
+    value,
+    CASE WHEN json_valid(metadata) THEN {METADATA_JSON_FUNC}(metadata) END,
+    CASE WHEN typeof(created_at) = 'integer' THEN created_at
+         ELSE coalesce(unixepoch(created_at, 'utc'), unixepoch()) END,
+    CASE WHEN typeof(updated_at) = 'integer' THEN updated_at
+         ELSE coalesce(unixepoch(updated_at, 'utc'), unixepoch()) END
+FROM memories_old
+WHERE id IN (SELECT max(id) FROM memories_old GROUP BY key)
+"""
 
-def init_db():
-    """Initialize the SQLite database with the required tables."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+# External-content FTS5 table over memories.value, kept in sync by triggers
+FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+        value, content='memories', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+        INSERT INTO memories_fts(rowid, value) VALUES (new.id, new.value);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+        INSERT INTO memories_fts(memories_fts, rowid, value)
+        VALUES ('delete', old.id, old.value);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE OF value ON memories BEGIN
+        INSERT INTO memories_fts(memories_fts, rowid, value)
+        VALUES ('delete', old.id, old.value);
+        INSERT INTO memories_fts(rowid, value) VALUES (new.id, new.value);
+    END
+    """,
+)
+
+
+@app.on_event("startup")
+async def init_db():
+    """Open the write and read SQLite connections and create the required tables."""
+    db = await aiosqlite.connect(DB_PATH)
+    read_db = None
+
+    # Each connection runs on its own thread, which would keep the process
+    # alive after a failed startup unless it is closed here
+    try:
+        await create_schema(db)
+        read_db = await connect_read_only()
+
+        # Kept up to date by the writer task so list_memories never counts rows
+        async with db.execute("SELECT COUNT(*) FROM memories") as cursor:
+            (app.state.memory_count,) = await cursor.fetchone()
+    except BaseException as exc:
+        for connection in (read_db, db):
+            if connection is not None:
+                await connection.close()
+        if isinstance(exc, sqlite3.Error):
+            raise RuntimeError(
+                f"Could not set up the memory database at {os.path.abspath(DB_PATH)}: {exc}"
+            ) from exc
+        raise
+
+    app.state.db = db
+    app.state.read_db = read_db
+    app.state.closing = False
+    app.state.write_queue = asyncio.Queue()
+    app.state.writer = asyncio.create_task(write_loop())
+
+
+async def connect_read_only():
+    """Open a read-only connection to the database for the read tools."""
+    uri = Path(DB_PATH).resolve().as_uri() + "?mode=ro"
+    read_db = await aiosqlite.connect(uri, uri=True)
+    try:
+        for pragma in READ_PRAGMAS:
+            await read_db.execute(pragma)
+    except BaseException:
+        await read_db.close()
+        raise
+    return read_db
+
+
+async def create_schema(db):
+    """Apply the connection pragmas and create or migrate the tables."""
+    for pragma in PRAGMAS:
+        await db.execute(pragma)
+
+    # Databases created by earlier versions of this example lack the unique
+    # key the upsert relies on, so their memories are copied to a new table
+    migrated = await migrate_schema(db)
 
     # Create memories table if it doesn't exist
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS memories (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        key TEXT NOT NULL,
-        value TEXT NOT NULL,
-        metadata TEXT,
-        created_at TEXT NOT NULL,
-        updated_at TEXT NOT NULL
+    await db.execute(MEMORIES_SCHEMA)
+
+    # Index the metadata tag so memories can be looked up by it
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_memories_tag ON memories(tag)")
+
+    # Index the listing order so pages are read in order instead of sorted
+    await db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_memories_created_desc ON memories(created_at DESC, id DESC)"
     )
-    """)
 
-    # Create index on key for faster lookups
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_memories_key ON memories(key)")
+    async with db.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'memories_fts'"
+    ) as cursor:
+        fts_exists = await cursor.fetchone() is not None
+
+    # Trigram full-text index so substring searches don't scan the table
+    for statement in FTS_SCHEMA:
+        await db.execute(statement)
+
+    if migrated or not fts_exists:
+        # Index any memories stored before the full-text table existed or
+        # copied over by a schema migration
+        await db.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+
+    await db.commit()
+
+    # Gather planner statistics for any index that needs them
+    await db.execute("PRAGMA optimize")
+
+
+async def migrate_schema(db):
+    """
+    Move memories from an older table layout into the current schema.
+
+    Args:
+        db: The database connection
+
+    Returns:
+        True if an existing table was migrated
+    """
+    async with db.execute("SELECT name FROM pragma_table_xinfo('memories')") as cursor:
+        columns = {name async for (name,) in cursor}
+
+    if not columns or {"revision", "tag"} <= columns:
+        return False
+
+    await db.execute("BEGIN IMMEDIATE")
+    try:
+        # Renaming also carries the old triggers and indexes along, so they
+        # are dropped with the old table and recreated on the new one
+        await db.execute("ALTER TABLE memories RENAME TO memories_old")
+        await db.execute(MEMORIES_SCHEMA)
+        await db.execute(SQL_MIGRATE_COPY)
+        await db.execute("DROP TABLE memories_old")
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return True
+
+
+@app.on_event("shutdown")
+async def close_db():
+    """Stop the writer task and close the shared SQLite connection."""
+    # Refuse new writes, then let the writer commit everything queued before
+    # the stop marker. Stopping it with a marker rather than cancelling it
+    # means no queued write is dropped halfway through a batch.
+    app.state.closing = True
+    app.state.write_queue.put_nowait(None)
+    await app.state.writer
+
+    await app.state.read_db.close()
+    await app.state.db.execute("PRAGMA optimize")
+    await app.state.db.close()
+
+
+async def write_loop():
+    """Commit queued write operations in batches, one transaction per batch."""
+    db = app.state.db
+    queue = app.state.write_queue
+    loop = asyncio.get_running_loop()
+    writes_since_optimize = 0
+    batch = []
+    stopping = False
+
+    try:
+        while not stopping:
+            # None is the stop marker queued by close_db
+            write = await queue.get()
+            if write is None:
+                break
+            batch = [write]
+            deadline = loop.time() + WRITE_BATCH_WINDOW
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    write = await asyncio.wait_for(queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+
+            writes_since_optimize += await run_batch(db, batch)
+
+            if writes_since_optimize >= OPTIMIZE_EVERY_WRITES:
+                writes_since_optimize = 0
+                try:
+                    await db.execute("PRAGMA optimize")
+                except sqlite3.Error:
+                    pass
+    finally:
+        # If the writer is cancelled, fail the writes it did not finish so
+        # their callers don't wait forever
+        pending = batch + [queue.get_nowait() for _ in range(queue.qsize())]
+        for write in pending:
+            if write is None:
+                continue
+            _, future = write
+            if not future.done():
+                future.set_exception(RuntimeError("The memory server is shutting down"))
+        if db.in_transaction:
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+
+
+async def run_batch(db, batch):
+    """
+    Run a batch of write operations in one transaction and resolve their futures.
+
+    Args:
+        db: The database connection
+        batch: A list of (operation, future) pairs
 
-    conn.commit()
-    conn.close()
+    Returns:
+        The number of operations committed
+    """
+    committed = 0
+    outcomes = []
+    count_delta = 0
+    try:
+        await db.execute("BEGIN IMMEDIATE")
+        for op, future in batch:
+            # A savepoint per operation keeps one failing write from
+            # discarding the rest of the batch
+            await db.execute("SAVEPOINT write_op")
+            try:
+                result, delta = await op(db)
+                outcomes.append((future, result, None))
+                count_delta += delta
+            except Exception as exc:
+                await db.execute("ROLLBACK TO write_op")
+                outcomes.append((future, None, exc))
+            await db.execute("RELEASE write_op")
+        await db.commit()
+        # Only count rows from a batch that actually committed
+        app.state.memory_count += count_delta
+        committed = len(batch)
+    except Exception as exc:
+        try:
+            await db.rollback()
+        except Exception:
+            # The next batch's BEGIN fails and retries the rollback, but
+            # the writer task itself must keep running
+            pass
+        outcomes = [(future, None, exc) for _, future in batch]
+
+    for future, result, exc in outcomes:
+        if future.done():
+            continue
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    return committed
+
+
+async def submit_write(op):
+    """
+    Queue a write operation for the writer task and wait for its result.
+
+    Args:
+        op: A coroutine function taking the database connection and
+            returning a (result, change in memory count) pair
+
+    Returns:
+        The result returned by the operation
+    """
+    if app.state.closing:
+        raise RuntimeError("The memory server is shutting down")
+
+    future = asyncio.get_running_loop().create_future()
+    await app.state.write_queue.put((op, future))
+    return await future
+
+
+def memory_from_row(row):
+    """
+    Build a memory response dict from a (key, value, metadata, ...) row.
+
+    The metadata column is selected as JSON text, so it is embedded as-is.
+    """
+    key, value, metadata_json, created_at, updated_at = row[:5]
+    return {
+        "key": key,
+        "value": value,
+        "metadata": orjson.Fragment(metadata_json) if metadata_json else None,
+        "created_at": created_at,
+        "updated_at": updated_at,
+    }
+
+
+def dump_json(response, pretty=False):
+    """Serialize a response to JSON text, indented only when asked to."""
+    if pretty:
+        return orjson.dumps(response, option=orjson.OPT_INDENT_2).decode()
+    return orjson.dumps(response).decode()
 
 
 @app.tool(description="Store a memory with a key")
@@ -55,61 +430,77 @@ async def store_memory(key: str, value: str, metadata: Optional[Dict] = None):
     Returns:
         A confirmation message
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    metadata_json = orjson.dumps(metadata).decode() if metadata else None
 
-    # Check if memory with this key already exists
-    cursor.execute("SELECT id FROM memories WHERE key = ?", (key,))
-    existing = cursor.fetchone()
+    async def upsert(db):
+        # Insert the memory, or update it in place if the key already exists
+        async with db.execute(SQL_UPSERT, (key, value, metadata_json)) as cursor:
+            (inserted,) = await cursor.fetchone()
+        return inserted, int(inserted)
 
-    now = datetime.now().isoformat()
-    metadata_json = json.dumps(metadata) if metadata else None
+    inserted = await submit_write(upsert)
 
-    if existing:
-        # Update existing memory
-        cursor.execute(
-            "UPDATE memories SET value = ?, metadata = ?, updated_at = ? WHERE key = ?",
-            (value, metadata_json, now, key),
-        )
-        message = f"Memory with key '{key}' updated successfully"
+    if inserted:
+        message = f"Memory with key '{key}' stored successfully"
     else:
-        # Insert new memory
-        cursor.execute(
-            "INSERT INTO memories (key, value, metadata, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
-            (key, value, metadata_json, now, now),
+        message = f"Memory with key '{key}' updated successfully"
+
+    return [TextContent(type="text", text=message)]
+
+
+@app.tool(description="Store multiple memories in a single transaction")
+async def bulk_store_memories(items: list):
+    """
+    Store multiple memories at once.
+
+    Args:
+        items: A list of objects with "key", "value" and optional "metadata"
+
+    Returns:
+        A confirmation message
+    """
+    rows = [
+        (
+            item["key"],
+            item["value"],
+            orjson.dumps(item["metadata"]).decode() if item.get("metadata") else None,
         )
-        message = f"Memory with key '{key}' stored successfully"
+        for item in items
+    ]
 
-    conn.commit()
-    conn.close()
+    async def upsert_all(db):
+        # RETURNING tells each row's insert from an update, so new memories
+        # are counted without a query sized by the number of keys
+        inserted = 0
+        for row in rows:
+            async with db.execute(SQL_UPSERT, row) as cursor:
+                (row_inserted,) = await cursor.fetchone()
+            inserted += row_inserted
+        return None, inserted
 
-    return [TextContent(type="text", text=message)]
+    await submit_write(upsert_all)
+
+    return [TextContent(type="text", text=f"Stored {len(rows)} memories successfully")]
 
 
 @app.tool(description="Retrieve a memory by key")
-async def retrieve_memory(key: str):
+async def retrieve_memory(key: str, pretty: bool = False):
     """
     Retrieve a memory by its key.
 
     Args:
         key: The key of the memory to retrieve
+        pretty: Whether to indent the JSON response
 
     Returns:
         The memory value and metadata if found, otherwise a not found message
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute(
-        "SELECT value, metadata, created_at, updated_at FROM memories WHERE key = ?",
-        (key,),
-    )
-    result = cursor.fetchone()
-    conn.close()
+    async with app.state.read_db.execute(SQL_GET_BY_KEY, (key,)) as cursor:
+        result = await cursor.fetchone()
 
     if result:
         value, metadata_json, created_at, updated_at = result
-        metadata = json.loads(metadata_json) if metadata_json else None
+        metadata = orjson.Fragment(metadata_json) if metadata_json else None
 
         response = {
             "key": key,
@@ -119,54 +510,75 @@ async def retrieve_memory(key: str):
             "updated_at": updated_at,
         }
 
-        return [TextContent(type="text", text=json.dumps(response, indent=2))]
+        return [TextContent(type="text", text=dump_json(response, pretty))]
     else:
         return [TextContent(type="text", text=f"No memory found with key '{key}'")]
 
 
 @app.tool(description="List all stored memories")
-async def list_memories(limit: int = 10, offset: int = 0):
+async def list_memories(
+    limit: int = 10,
+    offset: int = 0,
+    include_total: bool = False,
+    pretty: bool = False,
+    after_created_at: Optional[int] = None,
+    after_id: Optional[int] = None,
+):
     """
     List all stored memories with pagination.
 
+    Pass the "next" values of a previous page as after_created_at and
+    after_id to continue from it without scanning the skipped rows.
+
     Args:
         limit: Maximum number of memories to return
         offset: Number of memories to skip
+        include_total: Whether to include the total number of stored memories
+        pretty: Whether to indent the JSON response
+        after_created_at: Only list memories created before this one
+        after_id: The id of the last memory of the previous page
 
     Returns:
         A list of stored memories
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # A page of zero rows can't tell whether more memories follow
+    if limit <= 0:
+        return [TextContent(type="text", text="limit must be a positive integer")]
 
-    # Get total count
-    cursor.execute("SELECT COUNT(*) FROM memories")
-    total = cursor.fetchone()[0]
+    keyset = after_created_at is not None
+    if keyset != (after_id is not None):
+        return [
+            TextContent(
+                type="text",
+                text="after_created_at and after_id must be given together",
+            )
+        ]
 
     # Get paginated results
-    cursor.execute(
-        "SELECT key, value, metadata, created_at, updated_at FROM memories ORDER BY created_at DESC LIMIT ? OFFSET ?",
-        (limit, offset),
-    )
-    results = cursor.fetchall()
-    conn.close()
-
-    memories = []
-    for key, value, metadata_json, created_at, updated_at in results:
-        metadata = json.loads(metadata_json) if metadata_json else None
-        memories.append(
-            {
-                "key": key,
-                "value": value,
-                "metadata": metadata,
-                "created_at": created_at,
-                "updated_at": updated_at,
-            }
-        )
+    if keyset:
+        sql, params = SQL_LIST_AFTER, (after_created_at, after_id, limit)
+    else:
+        sql, params = SQL_LIST, (limit, offset)
+
+    async with app.state.read_db.execute(sql, params) as cursor:
+        rows = [row async for row in cursor]
+    memories = [memory_from_row(row) for row in rows]
 
-    response = {"total": total, "limit": limit, "offset": offset, "memories": memories}
+    response = {"limit": limit}
+    if not keyset:
+        # A cursor replaces the offset, so only offset pages echo it
+        response["offset"] = offset
+    response["has_more"] = len(memories) == limit
+    response["memories"] = memories
+    if include_total:
+        response["total"] = app.state.memory_count
+        if not keyset:
+            response["has_more"] = offset + len(memories) < app.state.memory_count
+    if response["has_more"] and rows:
+        last_row = rows[-1]
+        response["next"] = {"after_created_at": last_row[3], "after_id": last_row[5]}
 
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+    return [TextContent(type="text", text=dump_json(response, pretty))]
 
 
 @app.tool(description="Delete a memory by key")
@@ -180,14 +592,13 @@ async def delete_memory(key: str):
     Returns:
         A confirmation message
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
 
-    cursor.execute("DELETE FROM memories WHERE key = ?", (key,))
-    deleted = cursor.rowcount > 0
+    async def delete(db):
+        async with db.execute(SQL_DELETE, (key,)) as cursor:
+            deleted = cursor.rowcount > 0
+        return deleted, -int(deleted)
 
-    conn.commit()
-    conn.close()
+    deleted = await submit_write(delete)
 
     if deleted:
         return [
@@ -200,60 +611,66 @@ async def delete_memory(key: str):
 
 
 @app.tool(description="Search memories by value")
-async def search_memories(query: str, limit: int = 10):
+async def search_memories(query: str, limit: int = 10, pretty: bool = False):
     """
     Search memories by value containing the query string.
 
     Args:
         query: The search query
         limit: Maximum number of results to return
+        pretty: Whether to indent the JSON response
 
     Returns:
         A list of matching memories
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # The trigram index serves LIKE patterns on the full-text table directly,
+    # but it can only match substrings of at least three characters
+    sql = SQL_SEARCH_FTS if len(query) >= 3 else SQL_SEARCH_SCAN
 
-    cursor.execute(
-        "SELECT key, value, metadata, created_at, updated_at FROM memories WHERE value LIKE ? ORDER BY created_at DESC LIMIT ?",
-        (f"%{query}%", limit),
-    )
-    results = cursor.fetchall()
-    conn.close()
+    async with app.state.read_db.execute(sql, (f"%{query}%", limit)) as cursor:
+        memories = [memory_from_row(row) async for row in cursor]
 
-    if not results:
+    if not memories:
         return [TextContent(type="text", text=f"No memories found matching '{query}'")]
 
-    memories = []
-    for key, value, metadata_json, created_at, updated_at in results:
-        metadata = json.loads(metadata_json) if metadata_json else None
-        memories.append(
-            {
-                "key": key,
-                "value": value,
-                "metadata": metadata,
-                "created_at": created_at,
-                "updated_at": updated_at,
-            }
-        )
-
     response = {"query": query, "count": len(memories), "memories": memories}
 
-    return [TextContent(type="text", text=json.dumps(response, indent=2))]
+    return [TextContent(type="text", text=dump_json(response, pretty))]
 
 
-if __name__ == "__main__":
-    # Initialize the database
-    init_db()
+@app.tool(description="Find memories by metadata tag")
+async def find_memories_by_tag(tag: str, limit: int = 10, pretty: bool = False):
+    """
+    Find memories whose metadata has the given "tag" value.
+
+    Args:
+        tag: The metadata tag to match
+        limit: Maximum number of results to return
+        pretty: Whether to indent the JSON response
+
+    Returns:
+        A list of matching memories
+    """
+    async with app.state.read_db.execute(SQL_FIND_BY_TAG, (tag, limit)) as cursor:
+        memories = [memory_from_row(row) async for row in cursor]
 
+    if not memories:
+        return [TextContent(type="text", text=f"No memories found with tag '{tag}'")]
+
+    response = {"tag": tag, "count": len(memories), "memories": memories}
+
+    return [TextContent(type="text", text=dump_json(response, pretty))]
+
+
+if __name__ == "__main__":
     print("Starting memory server on http://localhost:8000")
-    print("SQLite database initialized at:", os.path.abspath(DB_PATH))
+    print("SQLite database will be opened at:", os.path.abspath(DB_PATH))
     print("\nAvailable tools:")
-    for name, tool_info in app.tools.items():
-        print(f"  - {name}: {tool_info['schema'].description}")
+    for name, tool_entry in app.tools.items():
+        print(f"  - {name}: {tool_entry.schema.description}")
     print("\nDocumentation available at: http://localhost:8000/docs")
     print("SSE endpoint available at: http://localhost:8000/sse")
     print("\nPress Ctrl+C to stop the server")
 
-    # Run the application
+    # Run the application; the database is initialized on startup
     app.run(host="0.0.0.0", port=8000)
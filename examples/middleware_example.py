@@ -3,6 +3,9 @@ An example of using middleware with ezmcp.
 """
 
 import asyncio
+import itertools
+import logging
+import os
 import random
 import time
 
@@ -10,6 +13,8 @@ from starlette.requests import Request
 
 from ezmcp import EzmcpHTTPMiddleware, TextContent, ezmcp
 
+logger = logging.getLogger(__name__)
+
 # Create an ezmcp application
 app = ezmcp("middleware-example", debug=True)
 
@@ -17,14 +22,15 @@ app = ezmcp("middleware-example", debug=True)
 # Define a middleware using the decorator
 @app.middleware
 async def process_time_middleware(request: Request, call_next):
-    print(1)
-    print("process_time_middleware called")
     """Add a header with the processing time."""
-    start_time = time.perf_counter()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("process_time_middleware called")
+    start_time = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.perf_counter() - start_time
+    process_time = (time.perf_counter_ns() - start_time) / 1_000_000_000
     response.headers["X-Process-Time"] = str(process_time)
-    print(f"process_time: {process_time}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("process_time: %s", process_time)
     return response
 
 
@@ -33,9 +39,9 @@ class CustomHeaderMiddleware(EzmcpHTTPMiddleware):
     """Add a custom header to the response."""
 
     async def dispatch(self, request: Request, call_next):
-        print(2)
-        print("CustomHeaderMiddleware called")
         """Add a custom header to the response."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("CustomHeaderMiddleware called")
         response = await call_next(request)
         response.headers["X-Custom-Header"] = "Hello from middleware!"
         return response
@@ -44,23 +50,32 @@ class CustomHeaderMiddleware(EzmcpHTTPMiddleware):
 class CustomSleepMiddleware(EzmcpHTTPMiddleware):
     """Sleep for a random amount of time."""
 
+    def __init__(self, app):
+        super().__init__(app)
+        # Draw the delays once instead of calling the RNG on every request
+        self.delays = itertools.cycle([random.randint(0, 10) for _ in range(4096)])
+
     async def dispatch(self, request: Request, call_next):
-        print(3)
-        print("CustomSleepMiddleware called")
         """Sleep for a random amount of time."""
-        await asyncio.sleep(random.randint(0, 10))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("CustomSleepMiddleware called")
+        await asyncio.sleep(next(self.delays))
         return await call_next(request)
 
 
 # Add the custom middleware
 app.add_middleware(CustomHeaderMiddleware)
-app.add_middleware(CustomSleepMiddleware)
+
+# The sleep middleware delays every request by up to 10 seconds, so it is
+# only added for chaos testing when EZMCP_DEMO_SLEEP is set
+if os.getenv("EZMCP_DEMO_SLEEP"):
+    app.add_middleware(CustomSleepMiddleware)
 
 
 @app.middleware
 async def custom_middleware(request: Request, call_next):
-    print(4)
-    print("custom_middleware called")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("custom_middleware called")
     return await call_next(request)
 
 
@@ -73,6 +88,15 @@ async def echo(message: str):
 
 # Run the application
 if __name__ == "__main__":
+    # Show the order in which the middleware is called
+    # Only this module's logger is set to DEBUG, so libraries such as httpcore
+    # and uvicorn keep their default levels
+    if app.debug:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+
     print("Try accessing the docs at http://localhost:8000/docs")
     print("Check the response headers to see the middleware in action")
     app.run(host="0.0.0.0", port=8000)
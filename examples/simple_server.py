@@ -1,26 +1,53 @@
 """
 A simple example of using ezmcp to create a server with tools.
+
+Requires the `httpx[http2]`, `cachetools` and `orjson` packages.
 """
 
+import asyncio
 import base64
-import json
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
-from ezmcp import ImageContent, TextContent, ezmcp
+from ezmcp import ImageContent, ezmcp, make_text
 
 # Create an ezmcp application
 app = ezmcp("simple-server", debug=True)
 
+# Shared HTTP client so connections are pooled and kept alive across calls
+_client = httpx.AsyncClient(
+    follow_redirects=True,
+    headers={"User-Agent": "ezmcp Example (github.com/jujumilk3/ezmcp)"},
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=64),
+)
+
+# Base64-encoded image data by URL, so repeated fetches skip the download
+# and the re-encoding for five minutes
+_image_cache = TTLCache(maxsize=128, ttl=300)
+
+SAMPLE_IMAGE_URL = "https://placehold.co/600x400"
+
+# Largest website body fetch_website will read
+MAX_WEBSITE_BYTES = 5 * 1024 * 1024
+
+
+@app.on_event("shutdown")
+async def close_client():
+    """Close the shared HTTP client."""
+    await _client.aclose()
+
 
 @app.tool(description="Echo a message back to the user")
 async def echo(message: str):
     """Echo a message back to the user."""
-    return [TextContent(type="text", text=f"Echo: {message}")]
+    return make_text(f"Echo: {message}")
 
 
 @app.tool(description="Return user information as JSON")
-async def user_info(name: str, age: int, is_active: bool = True):
+async def user_info(name: str, age: int, is_active: bool = True, pretty: bool = False):
     """Return user information as JSON."""
     user_data = {
         "name": name,
@@ -28,46 +55,61 @@ async def user_info(name: str, age: int, is_active: bool = True):
         "is_active": is_active,
         "status": "active" if is_active else "inactive",
     }
-    return [TextContent(type="text", text=json.dumps(user_data, indent=2))]
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    return make_text(orjson.dumps(user_data, option=option).decode())
 
 
 @app.tool(description="Fetch a website and return its content")
 async def fetch_website(url: str):
     """Fetch a website and return its content."""
-    headers = {"User-Agent": "ezmcp Example (github.com/jujumilk3/ezmcp)"}
-    async with httpx.AsyncClient(follow_redirects=True, headers=headers) as client:
-        response = await client.get(url)
+    async with _client.stream("GET", url) as response:
         response.raise_for_status()
-        return [TextContent(type="text", text=response.text)]
+        too_large = f"Response from {url} is larger than {MAX_WEBSITE_BYTES} bytes"
+        if int(response.headers.get("content-length", 0)) > MAX_WEBSITE_BYTES:
+            raise ValueError(too_large)
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > MAX_WEBSITE_BYTES:
+                raise ValueError(too_large)
+
+    # Decode off the event loop, since large pages take a while
+    text = await asyncio.to_thread(body.decode, response.encoding, "replace")
+    return make_text(text)
 
 
 @app.tool(description="Add two numbers together")
 async def add(a: int, b: int = 0):
     """Add two numbers together."""
     result = a + b
-    return [TextContent(type="text", text=f"Result: {result}")]
+    return make_text(f"Result: {result}")
 
 
 @app.tool(description="Get a greeting with the user's name")
 async def greet(name: str = "World"):
     """Get a greeting with the user's name."""
-    return [TextContent(type="text", text=f"Hello, {name}!")]
+    return make_text(f"Hello, {name}!")
 
 
 @app.tool(description="Fetch a sample image")
 async def fetch_image():
     """Fetch a sample image."""
-    downloaded_image = httpx.get("https://placehold.co/600x400")
-    as_binary = downloaded_image.content
-    as_base64 = base64.b64encode(as_binary).decode("utf-8")
+    as_base64 = _image_cache.get(SAMPLE_IMAGE_URL)
+    if as_base64 is None:
+        downloaded_image = await _client.get(SAMPLE_IMAGE_URL)
+        downloaded_image.raise_for_status()
+        as_binary = downloaded_image.content
+        as_base64 = base64.b64encode(as_binary).decode("ascii")
+        _image_cache[SAMPLE_IMAGE_URL] = as_base64
     return [ImageContent(type="image", data=as_base64, mimeType="image/png")]
 
 
 if __name__ == "__main__":
     print("Starting ezmcp server on http://localhost:8000")
     print("Available tools:")
-    for name, tool_info in app.tools.items():
-        print(f"  - {name}: {tool_info['schema'].description}")
+    for name, tool_entry in app.tools.items():
+        print(f"  - {name}: {tool_entry.schema.description}")
     print("\nDocumentation available at: http://localhost:8000/docs")
     print("SSE endpoint available at: http://localhost:8000/sse")
     print("\nPress Ctrl+C to stop the server")
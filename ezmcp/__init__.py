@@ -2,7 +2,14 @@ __version__ = "0.0.2"
 
 from ezmcp.app import ezmcp
 from ezmcp.middleware import EzmcpHTTPMiddleware
-from ezmcp.types import EmbeddedResource, ImageContent, Response, TextContent, Tool
+from ezmcp.types import (
+    EmbeddedResource,
+    ImageContent,
+    Response,
+    TextContent,
+    Tool,
+    make_text,
+)
 
 __all__ = [
     "ezmcp",
@@ -12,4 +19,5 @@ __all__ = [
     "ImageContent",
     "EmbeddedResource",
     "EzmcpHTTPMiddleware",
+    "make_text",
 ]
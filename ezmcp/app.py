@@ -1,4 +1,6 @@
 import inspect
+import types
+from contextlib import asynccontextmanager
 from typing import (
     Annotated,
     Any,
@@ -6,7 +8,11 @@ from typing import (
     Dict,
     List,
     Optional,
+    Tuple,
     Type,
+    Union,
+    get_args,
+    get_origin,
     get_type_hints,
 )
 
@@ -14,6 +20,7 @@ import mcp.types as mcp_types
 from mcp.server.lowlevel import Server
 from mcp.server.sse import SseServerTransport
 from starlette.applications import Starlette
+from starlette.datastructures import State
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import HTMLResponse
 from starlette.routing import Mount, Route
@@ -25,7 +32,7 @@ from ezmcp.templates import (
     PARAM_ROW_TEMPLATE,
     TOOL_CARD_TEMPLATE,
 )
-from ezmcp.types import ParamInfo, Response, Tool, ToolFunc
+from ezmcp.types import ParamInfo, Response, Tool, ToolEntry, ToolFunc
 
 
 class ezmcp:
@@ -76,11 +83,21 @@ class ezmcp:
         self.server = Server(self.name)
 
         # Store registered tools
-        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.tools: Dict[str, ToolEntry] = {}
+
+        # Tool listing and rendered docs page, built once and reset whenever
+        # a tool is registered
+        self._tool_schemas: Optional[List[mcp_types.Tool]] = None
+        self._docs_html: Optional[bytes] = None
 
         # Store middleware
         self.user_middleware: List[Middleware] = []
 
+        # Store lifecycle event handlers and shared application state
+        self.startup_handlers: List[Callable] = []
+        self.shutdown_handlers: List[Callable] = []
+        self.state = State()
+
         # Create middleware decorator
         self.middleware = create_middleware_decorator(self)
 
@@ -105,34 +122,67 @@ class ezmcp:
         # Reset starlette_app to ensure middleware is applied
         self.starlette_app = None
 
+    def on_event(self, event_type: str):
+        """
+        Decorator to register a handler for an application lifecycle event.
+
+        Args:
+            event_type: Either "startup" or "shutdown"
+        """
+        if event_type == "startup":
+            handlers = self.startup_handlers
+        elif event_type == "shutdown":
+            handlers = self.shutdown_handlers
+        else:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        def decorator(func: Callable) -> Callable:
+            handlers.append(func)
+            return func
+
+        return decorator
+
+    @asynccontextmanager
+    async def _lifespan(self, app: Starlette):
+        """Run the registered startup and shutdown handlers."""
+        for handler in self.startup_handlers:
+            result = handler()
+            if inspect.isawaitable(result):
+                await result
+        try:
+            yield
+        finally:
+            for handler in self.shutdown_handlers:
+                result = handler()
+                if inspect.isawaitable(result):
+                    await result
+
     def _setup_server_handlers(self):
         """Set up the MCP server handlers."""
 
         @self.server.call_tool()
         async def call_tool(name: str, arguments: dict) -> Response:
-            if name not in self.tools:
+            tool_entry = self.tools.get(name)
+            if tool_entry is None:
                 raise ValueError(f"Unknown tool: {name}")
 
-            tool_info = self.tools[name]
-            func = tool_info["func"]
-
             # Map arguments to function parameters
-            kwargs = {}
-            for param_name, param_info in tool_info["params"].items():
-                if param_name in arguments:
-                    kwargs[param_name] = arguments[param_name]
-                elif param_info.required:
-                    raise ValueError(
-                        f"Missing required argument '{param_name}' for tool '{name}'"
-                    )
-                else:
-                    kwargs[param_name] = param_info.default
+            try:
+                args, kwargs = tool_entry.bind(arguments)
+            except KeyError as exc:
+                raise ValueError(
+                    f"Missing required argument '{exc.args[0]}' for tool '{name}'"
+                ) from None
 
-            return await func(**kwargs)
+            return await tool_entry.func(*args, **kwargs)
 
         @self.server.list_tools()
         async def list_tools() -> List[mcp_types.Tool]:
-            return [tool_info["schema"] for tool_info in self.tools.values()]
+            if self._tool_schemas is None:
+                self._tool_schemas = [
+                    tool_entry.schema for tool_entry in self.tools.values()
+                ]
+            return self._tool_schemas
 
     async def _handle_sse(self, request):
         """Handle SSE connections."""
@@ -145,14 +195,20 @@ class ezmcp:
 
     async def _handle_docs(self, request):
         """Handle documentation page requests."""
+        if self._docs_html is None:
+            self._docs_html = self._render_docs().encode("utf-8")
+        return HTMLResponse(self._docs_html)
+
+    def _render_docs(self) -> str:
+        """Render the documentation page HTML."""
         tools_html = ""
 
         # Sort tools by name for consistent display
         sorted_tools = sorted(self.tools.items(), key=lambda x: x[0])
 
-        for name, tool_info in sorted_tools:
-            schema = tool_info["schema"]
-            params = tool_info["params"]
+        for name, tool_entry in sorted_tools:
+            schema = tool_entry.schema
+            params = tool_entry.params
 
             # Generate parameter rows for the table
             params_rows = ""
@@ -220,15 +276,13 @@ class ezmcp:
             tools_html += tool_card
 
         # Create documentation page
-        html_content = DOCS_TEMPLATE.format(
+        return DOCS_TEMPLATE.format(
             app_name=self.name,
             sse_endpoint=self.sse_endpoint,
             sse_path=self.sse_path,
             tools_html=tools_html,
         )
 
-        return HTMLResponse(html_content)
-
     def _create_starlette_app(self):
         """Create the Starlette application."""
         if self.starlette_app is None:
@@ -250,6 +304,7 @@ class ezmcp:
                 debug=self.debug,
                 routes=routes,
                 middleware=middleware,
+                lifespan=self._lifespan,
             )
         return self.starlette_app
 
@@ -284,6 +339,49 @@ class ezmcp:
 
         return params
 
+    def _create_binder(
+        self, func: Callable, params: Dict[str, ParamInfo]
+    ) -> Callable[[Dict[str, Any]], Tuple[tuple, Dict[str, Any]]]:
+        """
+        Compile a function that maps call arguments to a tool's parameters.
+
+        The generated function looks each parameter up directly, e.g.
+        `return (arguments["a"], arguments.get("b", _default_1)), {}`, so no
+        parameter info is walked per call. A missing required argument raises
+        KeyError with the parameter name.
+        """
+        signature = inspect.signature(func)
+        namespace: Dict[str, Any] = {}
+        positional = []
+        keyword = []
+
+        for index, (param_name, param_info) in enumerate(params.items()):
+            kind = signature.parameters[param_name].kind
+            if kind in (
+                inspect.Parameter.VAR_POSITIONAL,
+                inspect.Parameter.VAR_KEYWORD,
+            ):
+                continue
+
+            if param_info.required:
+                value = f"arguments[{param_name!r}]"
+            else:
+                default_name = f"_default_{index}"
+                namespace[default_name] = param_info.default
+                value = f"arguments.get({param_name!r}, {default_name})"
+
+            if kind is inspect.Parameter.KEYWORD_ONLY:
+                keyword.append(f"{param_name!r}: {value}")
+            else:
+                positional.append(f"{value},")
+
+        source = (
+            "def bind(arguments):\n"
+            f"    return ({' '.join(positional)}), {{{', '.join(keyword)}}}\n"
+        )
+        exec(source, namespace)
+        return namespace["bind"]
+
     def _create_tool_schema(
         self, name: str, description: str, params: Dict[str, ParamInfo]
     ) -> Tool:
@@ -295,23 +393,30 @@ class ezmcp:
             if param_info.required:
                 required.append(param_name)
 
+            # Optional[X] is advertised as X; leaving it out passes the default
+            param_type = param_info.type
+            if get_origin(param_type) in (Union, types.UnionType):
+                args = [arg for arg in get_args(param_type) if arg is not type(None)]
+                if len(args) == 1:
+                    param_type = args[0]
+
             # Map Python types to JSON Schema types
-            if param_info.type in (str, Annotated[str, ...]):
+            if param_type in (str, Annotated[str, ...]):
                 type_name = "string"
-            elif param_info.type in (int, Annotated[int, ...]):
+            elif param_type in (int, Annotated[int, ...]):
                 type_name = "integer"
-            elif param_info.type in (float, Annotated[float, ...]):
+            elif param_type in (float, Annotated[float, ...]):
                 type_name = "number"
-            elif param_info.type in (bool, Annotated[bool, ...]):
+            elif param_type in (bool, Annotated[bool, ...]):
                 type_name = "boolean"
-            elif param_info.type in (
+            elif param_type in (
                 list,
                 List,
                 Annotated[list, ...],
                 Annotated[List, ...],
             ):
                 type_name = "array"
-            elif param_info.type in (
+            elif param_type in (
                 dict,
                 Dict,
                 Annotated[dict, ...],
@@ -366,12 +471,13 @@ class ezmcp:
             # Create tool schema
             schema = self._create_tool_schema(name, description, params)
 
+            # Compile argument binding
+            bind = self._create_binder(func, params)
+
             # Register tool
-            self.tools[name] = {
-                "func": func,
-                "params": params,
-                "schema": schema,
-            }
+            self.tools[name] = ToolEntry(func, params, schema, bind)
+            self._tool_schemas = None
+            self._docs_html = None
 
             return func
 
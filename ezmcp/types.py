@@ -1,8 +1,10 @@
 from typing import (
     Any,
     Callable,
+    Dict,
     List,
     Optional,
+    Tuple,
     Type,
     Union,
 )
@@ -16,6 +18,7 @@ __all__ = [
     "EmbeddedResource",
     "Tool",
     "Response",
+    "make_text",
 ]
 
 # Type alias for response content.
@@ -27,6 +30,22 @@ Response = List[Union[TextContent, ImageContent, EmbeddedResource]]
 ToolFunc = Callable[..., Response]
 
 
+def make_text(text: str) -> Response:
+    """
+    Build a response holding a single text content.
+
+    The content is built with `model_construct`, skipping pydantic validation
+    since the fields are already known to be valid.
+
+    Args:
+        text: The text to return
+
+    Returns:
+        A response containing one TextContent
+    """
+    return [TextContent.model_construct(type="text", text=text)]
+
+
 # Type for parameter info
 class ParamInfo:
     def __init__(
@@ -42,3 +61,21 @@ class ParamInfo:
         self.required = required
         self.description = description
         self.default = default
+
+
+# Type for registered tool info
+class ToolEntry:
+    __slots__ = ("func", "params", "schema", "bind")
+
+    def __init__(
+        self,
+        func: ToolFunc,
+        params: Dict[str, ParamInfo],
+        schema: Tool,
+        bind: Callable[[Dict[str, Any]], Tuple[tuple, Dict[str, Any]]],
+    ):
+        self.func = func
+        self.params = params
+        self.schema = schema
+        # Maps call arguments to (args, kwargs) for func
+        self.bind = bind
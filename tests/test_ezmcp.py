@@ -1,6 +1,10 @@
+import asyncio
+from typing import Dict, Optional
+
 import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, ListToolsRequest
 
-from ezmcp import TextContent, ezmcp
+from ezmcp import TextContent, ezmcp, make_text
 
 
 @pytest.fixture
@@ -27,11 +31,11 @@ def test_tool_registration(app):
         return [TextContent(type="text", text=f"Test: {param1}, {param2}")]
 
     assert "test_tool" in app.tools
-    assert app.tools["test_tool"]["schema"].name == "test_tool"
-    assert app.tools["test_tool"]["schema"].description == "Test tool"
+    assert app.tools["test_tool"].schema.name == "test_tool"
+    assert app.tools["test_tool"].schema.description == "Test tool"
 
     # Check that parameters are correctly extracted
-    params = app.tools["test_tool"]["params"]
+    params = app.tools["test_tool"].params
     assert "param1" in params
     assert params["param1"].required is True
     assert "param2" in params
@@ -39,6 +43,67 @@ def test_tool_registration(app):
     assert params["param2"].default == 0
 
 
+def test_tool_entry(app):
+    """Test that registered tools are slotted entries with a compiled binder."""
+
+    @app.tool(description="Test tool")
+    async def test_tool(param1: str, param2: int = 0):
+        return [TextContent(type="text", text=f"Test: {param1}, {param2}")]
+
+    tool_entry = app.tools["test_tool"]
+    assert tool_entry.func is test_tool
+    assert tool_entry.bind({"param1": "a"}) == (("a", 0), {})
+    assert not hasattr(tool_entry, "__dict__")
+
+
+def call_tool(app, name, arguments):
+    """Call a registered tool through the MCP server's call_tool handler."""
+    handler = app.server.request_handlers[CallToolRequest]
+    request = CallToolRequest(
+        method="tools/call",
+        params=CallToolRequestParams(name=name, arguments=arguments),
+    )
+    return asyncio.run(handler(request)).root
+
+
+def test_call_tool(app):
+    """Test that tool calls bind arguments and fill in defaults."""
+
+    @app.tool(description="Test tool")
+    async def test_tool(param1: str, param2: int = 0):
+        return [TextContent(type="text", text=f"Test: {param1}, {param2}")]
+
+    result = call_tool(app, "test_tool", {"param1": "a"})
+    assert result.isError is False
+    assert result.content[0].text == "Test: a, 0"
+
+    result = call_tool(app, "test_tool", {"param1": "a", "param2": 5})
+    assert result.content[0].text == "Test: a, 5"
+
+    result = call_tool(app, "missing_tool", {})
+    assert result.isError is True
+
+
+def test_tool_binder(app):
+    """Test that the compiled binder maps arguments to parameters."""
+
+    @app.tool(description="Test tool")
+    async def test_tool(param1: str, param2: int = 0, *, flag: bool = False):
+        return [TextContent(type="text", text=f"Test: {param1}, {param2}, {flag}")]
+
+    bind = app.tools["test_tool"].bind
+    assert bind({"param1": "a"}) == (("a", 0), {"flag": False})
+    assert bind({"param1": "a", "param2": 2, "flag": True}) == (
+        ("a", 2),
+        {"flag": True},
+    )
+    with pytest.raises(KeyError):
+        bind({})
+
+    result = call_tool(app, "test_tool", {"param1": "a", "flag": True})
+    assert result.content[0].text == "Test: a, 0, True"
+
+
 def test_tool_schema_generation(app):
     """Test that tool schemas are generated correctly."""
 
@@ -46,7 +111,7 @@ def test_tool_schema_generation(app):
     async def test_tool(param1: str, param2: int = 0):
         return [TextContent(type="text", text=f"Test: {param1}, {param2}")]
 
-    schema = app.tools["test_tool"]["schema"]
+    schema = app.tools["test_tool"].schema
 
     # Check input schema
     input_schema = schema.inputSchema
@@ -60,6 +125,23 @@ def test_tool_schema_generation(app):
     assert properties["param2"]["type"] == "integer"
 
 
+def test_optional_schema_generation(app):
+    """Test that Optional parameters are advertised as their inner type."""
+
+    @app.tool(description="Test tool")
+    async def test_tool(
+        count: Optional[int] = None,
+        options: Optional[Dict] = None,
+        name: str | None = None,
+    ):
+        return [TextContent(type="text", text="Test")]
+
+    properties = app.tools["test_tool"].schema.inputSchema["properties"]
+    assert properties["count"]["type"] == "integer"
+    assert properties["options"]["type"] == "object"
+    assert properties["name"]["type"] == "string"
+
+
 def test_starlette_app_creation(app):
     """Test that the Starlette application is created correctly."""
     starlette_app = app.get_app()
@@ -94,3 +176,88 @@ def test_docs_disabled():
     # Check route paths
     paths = [route.path for route in routes]
     assert "/docs" not in paths
+
+
+def test_lifecycle_events():
+    """Test that startup and shutdown handlers run with the application."""
+    from starlette.testclient import TestClient
+
+    app = ezmcp("test-app")
+    events = []
+
+    @app.on_event("startup")
+    async def startup():
+        app.state.resource = "ready"
+        events.append("startup")
+
+    @app.on_event("shutdown")
+    def shutdown():
+        events.append("shutdown")
+
+    with TestClient(app.get_app()):
+        assert events == ["startup"]
+        assert app.state.resource == "ready"
+
+    assert events == ["startup", "shutdown"]
+
+
+def test_unknown_lifecycle_event(app):
+    """Test that registering an unknown event type fails."""
+    with pytest.raises(ValueError):
+        app.on_event("reload")
+
+
+def test_make_text():
+    """Test that make_text builds a single text content response."""
+    response = make_text("Hello")
+
+    assert len(response) == 1
+    assert isinstance(response[0], TextContent)
+    assert response[0].type == "text"
+    assert response[0].text == "Hello"
+    assert response[0] == TextContent(type="text", text="Hello")
+
+
+def test_list_tools_cache(app):
+    """Test that the tool listing is reused until a new tool is registered."""
+    handler = app.server.request_handlers[ListToolsRequest]
+
+    def list_tool_names():
+        result = asyncio.run(handler(ListToolsRequest(method="tools/list"))).root
+        return [tool.name for tool in result.tools]
+
+    @app.tool(description="First tool")
+    async def first_tool():
+        return make_text("first")
+
+    assert list_tool_names() == ["first_tool"]
+    cached = app._tool_schemas
+    assert list_tool_names() == ["first_tool"]
+    assert app._tool_schemas is cached
+
+    @app.tool(description="Second tool")
+    async def second_tool():
+        return make_text("second")
+
+    assert list_tool_names() == ["first_tool", "second_tool"]
+
+
+def test_docs_cache(app):
+    """Test that the docs page is rendered once and refreshed on registration."""
+    from starlette.testclient import TestClient
+
+    @app.tool(description="First tool")
+    async def first_tool():
+        return make_text("first")
+
+    client = TestClient(app.get_app())
+    response = client.get("/docs")
+    assert response.status_code == 200
+    assert "first_tool" in response.text
+    assert client.get("/docs").text == response.text
+
+    @app.tool(description="Second tool")
+    async def second_tool():
+        return make_text("second")
+
+    assert "second_tool" in client.get("/docs").text
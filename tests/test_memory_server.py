@@ -0,0 +1,181 @@
+import asyncio
+import importlib.util
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("orjson")
+
+MEMORY_SERVER_PATH = Path(__file__).parent.parent / "examples" / "memory_server.py"
+
+
+@pytest.fixture
+def memory_server(tmp_path):
+    """Load a fresh copy of the memory server example using a temporary database."""
+    spec = importlib.util.spec_from_file_location("memory_server", MEMORY_SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.DB_PATH = str(tmp_path / "memory.db")
+    return module
+
+
+async def call_tool(app, name, arguments):
+    """Call a tool through the MCP server's call_tool handler, with input validation."""
+    handler = app.server.request_handlers[CallToolRequest]
+    request = CallToolRequest(
+        method="tools/call",
+        params=CallToolRequestParams(name=name, arguments=arguments),
+    )
+    result = (await handler(request)).root
+    assert not result.isError, result.content[0].text
+    return result.content[0].text
+
+
+def run_server(app, scenario):
+    """Run a scenario coroutine function between the app's startup and shutdown."""
+
+    async def main():
+        for handler in app.startup_handlers:
+            await handler()
+        try:
+            await scenario()
+        finally:
+            for handler in app.shutdown_handlers:
+                await handler()
+
+    asyncio.run(main())
+
+
+def test_list_memories_keyset_pagination(memory_server):
+    """Test that a page's "next" cursor can be passed back to list_memories."""
+    app = memory_server.app
+
+    async def scenario():
+        items = [{"key": f"key{i}", "value": f"value{i}"} for i in range(5)]
+        await call_tool(app, "bulk_store_memories", {"items": items})
+
+        seen = []
+        arguments = {"limit": 2}
+        while True:
+            page = json.loads(await call_tool(app, "list_memories", arguments))
+            if "after_id" in arguments:
+                assert "offset" not in page
+            seen += [memory["key"] for memory in page["memories"]]
+            if "next" not in page:
+                break
+            assert isinstance(page["next"]["after_id"], int)
+            arguments = {"limit": 2, **page["next"]}
+
+        assert seen == [f"key{i}" for i in reversed(range(5))]
+
+    run_server(app, scenario)
+
+
+def test_store_memory_tag_round_trip(memory_server):
+    """Test that metadata stored through store_memory can be found by its tag."""
+    app = memory_server.app
+
+    async def scenario():
+        await call_tool(
+            app,
+            "store_memory",
+            {"key": "tagged", "value": "hello", "metadata": {"tag": "greeting"}},
+        )
+        await call_tool(app, "store_memory", {"key": "untagged", "value": "hi"})
+
+        found = json.loads(
+            await call_tool(app, "find_memories_by_tag", {"tag": "greeting"})
+        )
+        assert found["count"] == 1
+        assert found["memories"][0]["key"] == "tagged"
+        assert found["memories"][0]["metadata"] == {"tag": "greeting"}
+
+    run_server(app, scenario)
+
+
+def test_reads_do_not_see_uncommitted_writes(memory_server):
+    """Test that the read tools only see writes once their batch commits."""
+    app = memory_server.app
+
+    async def scenario():
+        inserted = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_insert(db):
+            upsert = (memory_server.SQL_UPSERT, ("pending", "value", None))
+            async with db.execute(*upsert) as cursor:
+                await cursor.fetchone()
+            inserted.set()
+            await release.wait()
+            return None, 1
+
+        write = asyncio.create_task(memory_server.submit_write(slow_insert))
+        await inserted.wait()
+        try:
+            text = await call_tool(app, "retrieve_memory", {"key": "pending"})
+            assert text == "No memory found with key 'pending'"
+        finally:
+            release.set()
+            await write
+        text = await call_tool(app, "retrieve_memory", {"key": "pending"})
+        assert json.loads(text)["value"] == "value"
+
+    run_server(app, scenario)
+
+
+def test_migrate_baseline_timestamps(memory_server, monkeypatch):
+    """Test that local-time ISO timestamps of an old table are migrated correctly."""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available")
+    monkeypatch.setenv("TZ", "Asia/Seoul")
+    time.tzset()
+    try:
+        stamp = datetime(2025, 1, 1, 12, 0, 0)
+        with sqlite3.connect(memory_server.DB_PATH) as connection:
+            connection.execute(
+                """
+                CREATE TABLE memories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    metadata TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "INSERT INTO memories (key, value, metadata, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ("old", "value", None, stamp.isoformat(), stamp.isoformat()),
+            )
+        connection.close()
+
+        app = memory_server.app
+
+        async def scenario():
+            memory = json.loads(await call_tool(app, "retrieve_memory", {"key": "old"}))
+            assert memory["created_at"] == int(stamp.timestamp())
+            assert memory["updated_at"] == int(stamp.timestamp())
+
+        run_server(app, scenario)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_list_memories_rejects_non_positive_limit(memory_server):
+    """Test that list_memories reports a usage error for a non-positive limit."""
+    app = memory_server.app
+
+    async def scenario():
+        text = await call_tool(app, "list_memories", {"limit": 0})
+        assert text == "limit must be a positive integer"
+
+    run_server(app, scenario)